@@ -3,6 +3,7 @@
 
 import http.server
 import socketserver
+import threading
 import webbrowser
 from urllib.parse import parse_qs, urlencode, urlparse
 
@@ -27,8 +28,18 @@ SCOPES = " ".join(
     ]
 )
 
-# Global to store the auth code
+AUTH_URL = "https://accounts.spotify.com/authorize?" + urlencode(
+    {
+        "client_id": CLIENT_ID,
+        "response_type": "code",
+        "redirect_uri": REDIRECT_URI,
+        "scope": SCOPES,
+    }
+)
+
+# Set by the callback handler; auth_done fires on success or error
 auth_code = None
+auth_done = threading.Event()
 
 
 class CallbackHandler(http.server.SimpleHTTPRequestHandler):
@@ -50,6 +61,7 @@ class CallbackHandler(http.server.SimpleHTTPRequestHandler):
                     b"<p>You can close this window and return to the terminal.</p>"
                     b"</body></html>"
                 )
+                auth_done.set()
             elif "error" in query:
                 self.send_response(400)
                 self.send_header("Content-type", "text/html")
@@ -58,6 +70,7 @@ class CallbackHandler(http.server.SimpleHTTPRequestHandler):
                 self.wfile.write(
                     f"<html><body><h1>Error: {error}</h1></body></html>".encode()
                 )
+                auth_done.set()
         else:
             self.send_response(404)
             self.end_headers()
@@ -66,39 +79,34 @@ class CallbackHandler(http.server.SimpleHTTPRequestHandler):
         pass  # Suppress logging
 
 
-def main():
-    global auth_code
+class CallbackServer(socketserver.ThreadingTCPServer):
+    """Handle each request on its own thread so extra browser requests
+    (favicon, preconnects) don't hold up the callback."""
+
+    allow_reuse_address = True
+    daemon_threads = True
 
-    # Step 1: Build authorization URL
-    auth_url = "https://accounts.spotify.com/authorize?" + urlencode(
-        {
-            "client_id": CLIENT_ID,
-            "response_type": "code",
-            "redirect_uri": REDIRECT_URI,
-            "scope": SCOPES,
-        }
-    )
 
-    # Step 2: Start local server to receive callback
+def main():
+    # Step 1: Start local server to receive callback
     print(f"Starting local server on port {PORT}...")
-    with socketserver.TCPServer(("127.0.0.1", PORT), CallbackHandler) as httpd:
-        httpd.timeout = 120  # 2 minute timeout
+    with CallbackServer(("127.0.0.1", PORT), CallbackHandler) as httpd:
+        threading.Thread(target=httpd.serve_forever, daemon=True).start()
 
         print("Opening browser for Spotify authorization...")
-        print(f"\nIf browser doesn't open, go to:\n{auth_url}\n")
-        webbrowser.open(auth_url)
+        print(f"\nIf browser doesn't open, go to:\n{AUTH_URL}\n")
+        webbrowser.open(AUTH_URL)
 
         print("Waiting for authorization (timeout: 2 minutes)...")
 
-        # Handle requests until we get the code
-        while auth_code is None:
-            httpd.handle_request()
+        auth_done.wait(timeout=120)
+        httpd.shutdown()
 
     if not auth_code:
         print("Error: No authorization code received")
         return
 
-    # Step 3: Exchange code for tokens
+    # Step 2: Exchange code for tokens
     print("\nExchanging code for tokens...")
     response = httpx.post(
         "https://accounts.spotify.com/api/token",
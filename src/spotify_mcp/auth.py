@@ -6,17 +6,20 @@ stored in Google Secret Manager. For local dev, uses environment variables.
 
 from __future__ import annotations
 
+import asyncio
+import base64
 import os
 import time
 from dataclasses import dataclass
 from typing import Optional
 
 import httpx
+import orjson
 
 SPOTIFY_TOKEN_URL = "https://accounts.spotify.com/api/token"
 
 
-@dataclass
+@dataclass(slots=True)
 class TokenInfo:
     """Spotify access token with expiration tracking."""
 
@@ -42,10 +45,12 @@ class SpotifyAuth:
 
     def __init__(
         self,
+        http: httpx.AsyncClient,
         client_id: Optional[str] = None,
         client_secret: Optional[str] = None,
         refresh_token: Optional[str] = None,
     ):
+        self._http = http
         self.client_id = client_id or os.environ.get("SPOTIFY_CLIENT_ID", "")
         self.client_secret = client_secret or os.environ.get(
             "SPOTIFY_CLIENT_SECRET", ""
@@ -54,12 +59,18 @@ class SpotifyAuth:
             "SPOTIFY_REFRESH_TOKEN", ""
         )
         self._token_info: Optional[TokenInfo] = None
+        self._auth_header = ""
+        # In-flight refresh shared by every caller that finds the token expired
+        self._refresh_task: Optional[asyncio.Task[None]] = None
 
         if not self.client_id or not self.client_secret:
             raise SpotifyAuthError(
                 "SPOTIFY_CLIENT_ID and SPOTIFY_CLIENT_SECRET are required"
             )
 
+        credentials = f"{self.client_id}:{self.client_secret}".encode()
+        self._basic_auth = "Basic " + base64.b64encode(credentials).decode()
+
     async def get_access_token(self) -> str:
         """Get a valid access token, refreshing if necessary."""
         if self._token_info and not self._token_info.is_expired:
@@ -70,53 +81,50 @@ class SpotifyAuth:
                 "No refresh token available. Complete OAuth flow first."
             )
 
-        await self._refresh_access_token()
+        if self._refresh_task is None:
+            self._refresh_task = asyncio.create_task(self._refresh_access_token())
+            self._refresh_task.add_done_callback(self._clear_refresh_task)
+        # Shield so a cancelled caller doesn't abort the refresh for the others
+        await asyncio.shield(self._refresh_task)
         return self._token_info.access_token  # type: ignore
 
+    def _clear_refresh_task(self, _: asyncio.Task[None]) -> None:
+        self._refresh_task = None
+
+    async def get_auth_header(self) -> str:
+        """Get the Bearer `Authorization` header value for a valid token."""
+        await self.get_access_token()
+        return self._auth_header
+
     async def _refresh_access_token(self) -> None:
         """Refresh the access token using the refresh token."""
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(
-                SPOTIFY_TOKEN_URL,
-                data={
-                    "grant_type": "refresh_token",
-                    "refresh_token": self._refresh_token,
-                },
-                auth=(self.client_id, self.client_secret),
-                headers={"Content-Type": "application/x-www-form-urlencoded"},
-            )
+        response = await self._http.post(
+            SPOTIFY_TOKEN_URL,
+            data={
+                "grant_type": "refresh_token",
+                "refresh_token": self._refresh_token,
+            },
+            headers={
+                "Authorization": self._basic_auth,
+                "Content-Type": "application/x-www-form-urlencoded",
+            },
+        )
 
         if response.status_code != 200:
             raise SpotifyAuthError(
                 f"Token refresh failed: {response.status_code} - {response.text}"
             )
 
-        data = response.json()
+        data = orjson.loads(response.content)
         self._token_info = TokenInfo(
             access_token=data["access_token"],
             expires_at=time.time() + data.get("expires_in", 3600),
             refresh_token=data.get("refresh_token", self._refresh_token),
             scope=data.get("scope", ""),
         )
+        self._auth_header = f"Bearer {self._token_info.access_token}"
 
         # If Spotify returned a new refresh token, update it
         if "refresh_token" in data:
             self._refresh_token = data["refresh_token"]
             # TODO: Persist new refresh token to Secret Manager/DB
-
-
-# Global auth instance (initialized on first use)
-_auth: Optional[SpotifyAuth] = None
-
-
-def get_auth() -> SpotifyAuth:
-    """Get or create the global SpotifyAuth instance."""
-    global _auth
-    if _auth is None:
-        _auth = SpotifyAuth()
-    return _auth
-
-
-async def get_access_token() -> str:
-    """Convenience function to get a valid access token."""
-    return await get_auth().get_access_token()
@@ -5,29 +5,168 @@ Thin async wrapper around the Spotify Web API using httpx.
 
 from __future__ import annotations
 
+import asyncio
+import random
+import time
+from collections.abc import AsyncIterator, Sequence
 from typing import Any, Optional
 
 import httpx
+import ijson
+import orjson
+from aiolimiter import AsyncLimiter
 
-from .auth import get_access_token
+from .auth import SpotifyAuth
 
 SPOTIFY_API_BASE = "https://api.spotify.com/v1"
 
+_DEFAULT_SEARCH_TYPES = "track"
+
+DEFAULT_MAX_RATE = 10.0  # requests per second
+DEFAULT_MAX_CONCURRENCY = 4
+
+# GET cache TTLs in seconds, picked by longest matching endpoint prefix.
+# A TTL of 0 (or no matching prefix) disables caching for that endpoint.
+# Player state and devices get sub-second/short TTLs: enough to absorb the
+# back-to-back "get playback; play; get playback" calls agents make, while
+# writes invalidate them immediately (see SpotifyClient._invalidate).
+_CACHE_TTLS: dict[str, float] = {
+    "/me": 300.0,
+    "/me/playlists": 60.0,
+    "/me/tracks": 0.0,
+    "/me/player": 0.5,
+    "/me/player/devices": 2.0,
+    "/me/player/currently-playing": 0.0,
+    "/me/player/queue": 0.0,
+    "/me/player/recently-played": 0.0,
+    "/tracks/": 3600.0,
+    "/albums/": 3600.0,
+    "/artists/": 3600.0,
+    "/playlists/": 60.0,
+}
+_CACHE_MAX_ENTRIES = 512
+
+# Status codes worth retrying, and the longest we'll sleep before a retry.
+# A Retry-After beyond the cap is surfaced to the caller instead of waited on.
+_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+_MAX_RETRY_DELAY = 60.0
+
+
+def _cache_ttl(endpoint: str) -> float:
+    """Return the cache TTL for an endpoint using longest-prefix match."""
+    best = ""
+    for prefix in _CACHE_TTLS:
+        if endpoint.startswith(prefix) and len(prefix) > len(best):
+            best = prefix
+    return _CACHE_TTLS.get(best, 0.0)
+
 
 class SpotifyAPIError(Exception):
     """Raised when a Spotify API call fails."""
 
+    __slots__ = ("message", "status_code")
+
     def __init__(self, status_code: int, message: str):
         self.status_code = status_code
         self.message = message
         super().__init__(f"Spotify API error {status_code}: {message}")
 
 
+def _api_error(response: httpx.Response) -> SpotifyAPIError:
+    """Build a SpotifyAPIError from an error response."""
+    try:
+        error_data = orjson.loads(response.content)
+        message = error_data.get("error", {}).get("message", response.text)
+    except Exception:
+        message = response.text
+    return SpotifyAPIError(response.status_code, message)
+
+
+def _decode(response: httpx.Response) -> dict[str, Any]:
+    """Decode a buffered response, raising SpotifyAPIError on failure."""
+    if response.status_code == 204:
+        return {}
+
+    if response.status_code >= 400:
+        raise _api_error(response)
+
+    # Some endpoints return non-JSON on success (e.g., player control
+    # endpoints return plain text), so only decode declared JSON bodies
+    content_type = response.headers.get("content-type", "")
+    if not response.content or "application/json" not in content_type:
+        return {}
+    return orjson.loads(response.content)
+
+
 class SpotifyClient:
     """Async client for Spotify Web API."""
 
-    def __init__(self, timeout: float = 30.0):
+    def __init__(
+        self,
+        auth: SpotifyAuth,
+        http: httpx.AsyncClient,
+        timeout: float = 30.0,
+        max_rate: float = DEFAULT_MAX_RATE,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        max_retries: int = 5,
+        retry_writes: bool = False,
+    ):
+        self.auth = auth
+        self._http = http
         self.timeout = timeout
+        self._base = SPOTIFY_API_BASE
+        self.max_retries = max_retries
+        # POST/PUT/DELETE are only retried on opt-in (e.g. POST /me/player/next
+        # must not run twice if the first attempt actually went through)
+        self.retry_writes = retry_writes
+        if max_rate <= 0:
+            raise ValueError(f"max_rate must be positive, got {max_rate}")
+        if max_concurrency < 1:
+            raise ValueError(
+                f"max_concurrency must be at least 1, got {max_concurrency}"
+            )
+        # Token bucket (max_rate requests/second) plus an in-flight cap keep
+        # bursts such as asyncio.gather fan-outs below Spotify's rate limit.
+        # A bucket must hold at least one request, so rates below 1/s are
+        # expressed as one request per 1/max_rate seconds instead.
+        if max_rate >= 1:
+            self._bucket = AsyncLimiter(max_rate, 1)
+        else:
+            self._bucket = AsyncLimiter(1, 1 / max_rate)
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        # Monotonic time until which all callers hold off after a 429
+        self._cooldown_until = 0.0
+        self._cache: dict[tuple, tuple[float, dict[str, Any]]] = {}
+        # GETs currently on the wire, so identical concurrent reads share one
+        self._inflight: dict[tuple, asyncio.Task[dict[str, Any]]] = {}
+        # Bumped when a write starts and when it finishes; a GET only caches
+        # its result if no write overlapped it (see _fetch)
+        self._write_gen = 0
+        self._writes_in_flight = 0
+
+    def _cache_put(self, key: tuple, expires_at: float, value: dict[str, Any]) -> None:
+        """Store a GET response, evicting expired/oldest entries when full."""
+        if len(self._cache) >= _CACHE_MAX_ENTRIES:
+            now = time.monotonic()
+            for k in [k for k, (exp, _) in self._cache.items() if exp <= now]:
+                del self._cache[k]
+            if len(self._cache) >= _CACHE_MAX_ENTRIES:
+                del self._cache[next(iter(self._cache))]
+        self._cache[key] = (expires_at, value)
+
+    def _invalidate(self, endpoint: str) -> None:
+        """Drop cached GETs that a write to `endpoint` may have made stale.
+
+        Writes almost always touch user state (player, library, playlists),
+        so everything under /me is dropped along with the written resource.
+        """
+        resource = "/".join(endpoint.split("/")[:3])
+        for key in [k for k in self._cache if k[0].startswith(("/me", resource))]:
+            del self._cache[key]
+        # Reads already in flight may predate the write, so later callers
+        # must not join them (_fetch also keeps them out of the cache)
+        for key in [k for k in self._inflight if k[0].startswith(("/me", resource))]:
+            del self._inflight[key]
 
     async def _request(
         self,
@@ -37,43 +176,125 @@ class SpotifyClient:
         json_body: Optional[dict[str, Any]] = None,
     ) -> dict[str, Any]:
         """Make an authenticated request to Spotify API."""
-        token = await get_access_token()
-        url = f"{SPOTIFY_API_BASE}{endpoint}"
-
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.request(
+        if method == "GET":
+            return _decode(await self._send(method, endpoint, params, json_body))
+
+        # Invalidate on both sides of the write: before, so no caller reuses
+        # state it is about to change; after, so reads that ran concurrently
+        # with it (and may have seen the old state) are dropped too
+        self._invalidate(endpoint)
+        self._write_gen += 1
+        self._writes_in_flight += 1
+        try:
+            response = await self._send(method, endpoint, params, json_body)
+        finally:
+            self._writes_in_flight -= 1
+            self._write_gen += 1
+            self._invalidate(endpoint)
+        return _decode(response)
+
+    async def _send(
+        self,
+        method: str,
+        endpoint: str,
+        params: Optional[dict[str, Any]] = None,
+        json_body: Optional[dict[str, Any]] = None,
+        stream: bool = False,
+    ) -> httpx.Response:
+        """Send a request under the rate limit, retrying 429/5xx responses.
+
+        Returns the final response whatever its status. With `stream=True`
+        the body is left unread; the caller must `aclose()` the response.
+        """
+        url = self._base + endpoint
+        retryable = method == "GET" or self.retry_writes
+
+        for attempt in range(self.max_retries + 1):
+            await self._wait_for_cooldown()
+            request = self._http.build_request(
                 method,
                 url,
                 params=params,
                 json=json_body,
-                headers={"Authorization": f"Bearer {token}"},
+                headers={"Authorization": await self.auth.get_auth_header()},
+                timeout=self.timeout,
             )
+            # Only sending is throttled; a streamed body is read outside it
+            async with self._semaphore, self._bucket:
+                response = await self._http.send(request, stream=stream)
+
+            if response.status_code not in _RETRY_STATUSES:
+                break
+            delay = self._retry_delay(response, attempt)
+            if not retryable or attempt == self.max_retries or delay is None:
+                break
+            await response.aclose()
+            await asyncio.sleep(delay)
+
+        return response
+
+    def _retry_delay(self, response: httpx.Response, attempt: int) -> Optional[float]:
+        """Return how long to wait before retrying, or None to give up.
+
+        429s honor Retry-After and also start a shared cooldown so other
+        in-flight callers back off too; 5xx use exponential backoff.
+        """
+        backoff = min(_MAX_RETRY_DELAY, 2**attempt + random.random())
+        if response.status_code != 429:
+            return backoff
 
-        if response.status_code == 204:
-            return {}
-
-        if response.status_code >= 400:
-            try:
-                error_data = response.json()
-                message = error_data.get("error", {}).get("message", response.text)
-            except Exception:
-                message = response.text
-            raise SpotifyAPIError(response.status_code, message)
-
-        if not response.content or not response.text.strip():
-            return {}
-
-        # Try to parse JSON, but some endpoints return non-JSON on success
         try:
-            return response.json()
-        except Exception:
-            # Non-JSON response (e.g., player control endpoints return plain text)
-            return {}
+            delay = float(response.headers["Retry-After"])
+        except (KeyError, ValueError):
+            delay = backoff
+        if delay > _MAX_RETRY_DELAY:
+            return None
+        self._cooldown_until = max(self._cooldown_until, time.monotonic() + delay)
+        return delay
+
+    async def _wait_for_cooldown(self) -> None:
+        """Sleep until any rate-limit cooldown set by a 429 has passed."""
+        delay = self._cooldown_until - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
 
     async def get(
         self, endpoint: str, params: Optional[dict[str, Any]] = None
     ) -> dict[str, Any]:
-        return await self._request("GET", endpoint, params=params)
+        ttl = _cache_ttl(endpoint)
+        key = (endpoint, tuple(sorted((params or {}).items())))
+        if ttl > 0:
+            cached = self._cache.get(key)
+            if cached and cached[0] > time.monotonic():
+                return cached[1]
+
+        # Single-flight: concurrent callers for the same key await one request
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._fetch(key, endpoint, params, ttl))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._clear_inflight(key, t))
+        # Shield so a cancelled caller doesn't abort the request for the others
+        return await asyncio.shield(task)
+
+    async def _fetch(
+        self,
+        key: tuple,
+        endpoint: str,
+        params: Optional[dict[str, Any]],
+        ttl: float,
+    ) -> dict[str, Any]:
+        # A read that overlapped a write may hold pre-write state, so it is
+        # returned to its callers but never cached
+        gen = None if self._writes_in_flight else self._write_gen
+        result = await self._request("GET", endpoint, params=params)
+        if ttl > 0 and gen == self._write_gen:
+            self._cache_put(key, time.monotonic() + ttl, result)
+        return result
+
+    def _clear_inflight(self, key: tuple, task: asyncio.Task[dict[str, Any]]) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
 
     async def post(
         self,
@@ -96,6 +317,40 @@ class SpotifyClient:
     ) -> dict[str, Any]:
         return await self._request("DELETE", endpoint, params=params)
 
+    async def _get_several(
+        self, endpoint: str, key: str, ids: list[str], batch_size: int
+    ) -> dict[str, Any]:
+        """Fetch many objects from a bulk endpoint, batching ids concurrently."""
+        batches = [ids[i : i + batch_size] for i in range(0, len(ids), batch_size)]
+        pages = await asyncio.gather(
+            *(self.get(endpoint, params={"ids": ",".join(b)}) for b in batches)
+        )
+        return {key: [item for page in pages for item in page.get(key, [])]}
+
+    async def paginate_all(
+        self,
+        endpoint: str,
+        params: Optional[dict[str, Any]] = None,
+        limit: int = 50,
+    ) -> list[dict[str, Any]]:
+        """Fetch every item from an offset-paged endpoint.
+
+        The first page reveals `total`; the remaining pages are then requested
+        concurrently, throttled by the client's rate limiter.
+        """
+        params = {**(params or {}), "limit": limit}
+        first = await self.get(endpoint, params={**params, "offset": 0})
+        items = list(first.get("items", []))
+        pages = await asyncio.gather(
+            *(
+                self.get(endpoint, params={**params, "offset": offset})
+                for offset in range(limit, first.get("total", 0), limit)
+            )
+        )
+        for page in pages:
+            items.extend(page.get("items", []))
+        return items
+
     # ─────────────────────────────────────────────────────────────────
     # Player / Playback
     # ─────────────────────────────────────────────────────────────────
@@ -118,15 +373,16 @@ class SpotifyClient:
     ) -> dict[str, Any]:
         """Start or resume playback."""
         params = {"device_id": device_id} if device_id else None
-        body: dict[str, Any] = {}
-        if context_uri:
-            body["context_uri"] = context_uri
-        if uris:
-            body["uris"] = uris
-        if offset:
-            body["offset"] = offset
-        if position_ms is not None:
-            body["position_ms"] = position_ms
+        body = {
+            key: value
+            for key, value in (
+                ("context_uri", context_uri),
+                ("uris", uris),
+                ("offset", offset),
+                ("position_ms", position_ms),
+            )
+            if value is not None
+        }
         return await self.put("/me/player/play", json_body=body or None, params=params)
 
     async def pause(self, device_id: Optional[str] = None) -> dict[str, Any]:
@@ -212,7 +468,7 @@ class SpotifyClient:
     async def search(
         self,
         query: str,
-        types: list[str] = ["track"],
+        types: Optional[Sequence[str]] = None,
         limit: int = 20,
         offset: int = 0,
         market: Optional[str] = None,
@@ -220,7 +476,7 @@ class SpotifyClient:
         """Search for tracks, albums, artists, playlists, etc."""
         params: dict[str, Any] = {
             "q": query,
-            "type": ",".join(types),
+            "type": _DEFAULT_SEARCH_TYPES if types is None else ",".join(types),
             "limit": min(50, max(1, limit)),
             "offset": offset,
         }
@@ -240,6 +496,14 @@ class SpotifyClient:
         """Get album details."""
         return await self.get(f"/albums/{album_id}")
 
+    async def get_tracks(self, track_ids: list[str]) -> dict[str, Any]:
+        """Get details for many tracks (batched 50 ids per request)."""
+        return await self._get_several("/tracks", "tracks", track_ids, 50)
+
+    async def get_albums(self, album_ids: list[str]) -> dict[str, Any]:
+        """Get details for many albums (batched 20 ids per request)."""
+        return await self._get_several("/albums", "albums", album_ids, 20)
+
     async def get_album_tracks(
         self, album_id: str, limit: int = 50, offset: int = 0
     ) -> dict[str, Any]:
@@ -256,6 +520,10 @@ class SpotifyClient:
         """Get artist details."""
         return await self.get(f"/artists/{artist_id}")
 
+    async def get_artists(self, artist_ids: list[str]) -> dict[str, Any]:
+        """Get details for many artists (batched 50 ids per request)."""
+        return await self._get_several("/artists", "artists", artist_ids, 50)
+
     async def get_artist_top_tracks(
         self, artist_id: str, market: str = "US"
     ) -> dict[str, Any]:
@@ -280,18 +548,74 @@ class SpotifyClient:
     # Playlists
     # ─────────────────────────────────────────────────────────────────
 
-    async def get_playlist(self, playlist_id: str) -> dict[str, Any]:
-        """Get playlist details."""
-        return await self.get(f"/playlists/{playlist_id}")
+    async def get_playlist(
+        self, playlist_id: str, fields: Optional[str] = None
+    ) -> dict[str, Any]:
+        """Get playlist details, optionally projected with `fields`."""
+        params = {"fields": fields} if fields else None
+        return await self.get(f"/playlists/{playlist_id}", params=params)
 
     async def get_playlist_tracks(
-        self, playlist_id: str, limit: int = 100, offset: int = 0
+        self,
+        playlist_id: str,
+        limit: int = 100,
+        offset: int = 0,
+        fields: Optional[str] = None,
     ) -> dict[str, Any]:
-        """Get playlist tracks."""
-        return await self.get(
-            f"/playlists/{playlist_id}/tracks",
-            params={"limit": limit, "offset": offset},
-        )
+        """Get playlist tracks, optionally projected with `fields`."""
+        params: dict[str, Any] = {"limit": limit, "offset": offset}
+        if fields:
+            params["fields"] = fields
+        return await self.get(f"/playlists/{playlist_id}/tracks", params=params)
+
+    async def stream_playlist_tracks(
+        self, playlist_id: str, page_size: int = 100
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Yield every playlist item, parsing each page as it streams in.
+
+        Unlike get_playlist_tracks, a page's body and decoded tree are never
+        held in memory at once, so callers that only need a few fields per
+        item (e.g. track URIs) can walk large playlists cheaply.
+        """
+        endpoint = f"/playlists/{playlist_id}/tracks"
+        offset = 0
+        while True:
+            count = 0
+            params = {"limit": page_size, "offset": offset}
+            async for item in self._stream_items(endpoint, params):
+                count += 1
+                yield item
+            if count < page_size:
+                return
+            offset += page_size
+
+    async def _stream_items(
+        self, endpoint: str, params: dict[str, Any]
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Stream a paging object's `items` array with ijson.
+
+        Retries happen in _send before any bytes are consumed, so a page
+        that fails part-way through is raised rather than replayed.
+        """
+        response = await self._send("GET", endpoint, params, stream=True)
+
+        try:
+            if response.status_code >= 400:
+                await response.aread()
+                raise _api_error(response)
+
+            items: list[dict[str, Any]] = ijson.sendable_list()
+            parser = ijson.items_coro(items, "items.item", use_float=True)
+            async for chunk in response.aiter_bytes():
+                parser.send(chunk)
+                for item in items:
+                    yield item
+                del items[:]
+            parser.close()
+            for item in items:
+                yield item
+        finally:
+            await response.aclose()
 
     async def get_my_playlists(
         self, limit: int = 50, offset: int = 0
@@ -352,15 +676,3 @@ class SpotifyClient:
     async def get_recently_played(self, limit: int = 50) -> dict[str, Any]:
         """Get recently played tracks."""
         return await self.get("/me/player/recently-played", params={"limit": limit})
-
-
-# Global client instance
-_client: Optional[SpotifyClient] = None
-
-
-def get_client() -> SpotifyClient:
-    """Get or create the global SpotifyClient instance."""
-    global _client
-    if _client is None:
-        _client = SpotifyClient()
-    return _client
@@ -0,0 +1,51 @@
+"""Application-scoped Spotify resources.
+
+Bundles the shared HTTP pool with the auth and API clients built on it, so
+their lifetime is tied to an explicit lifespan instead of module globals.
+"""
+
+from __future__ import annotations
+
+import os
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+
+import httpx
+
+from .auth import SpotifyAuth
+from .client import DEFAULT_MAX_CONCURRENCY, DEFAULT_MAX_RATE, SpotifyClient
+from .http_client import create_http
+
+
+@dataclass
+class SpotifyContext:
+    """Spotify resources shared by all tool calls for one server run."""
+
+    http: httpx.AsyncClient
+    auth: SpotifyAuth
+    client: SpotifyClient
+
+
+@asynccontextmanager
+async def lifespan() -> AsyncIterator[SpotifyContext]:
+    """Create a SpotifyContext and close its connection pool on exit.
+
+    SPOTIFY_RPS and SPOTIFY_MAX_CONCURRENCY tune the client-side rate limit;
+    non-positive values are rejected with ValueError at startup.
+    """
+    max_rate = float(os.environ.get("SPOTIFY_RPS", DEFAULT_MAX_RATE))
+    max_concurrency = int(
+        os.environ.get("SPOTIFY_MAX_CONCURRENCY", DEFAULT_MAX_CONCURRENCY)
+    )
+    # Never let the pool be smaller than the number of requests allowed in
+    # flight, or callers would queue on the pool instead of the limiter
+    http = create_http(max_connections=max(100, max_concurrency))
+    try:
+        auth = SpotifyAuth(http)
+        client = SpotifyClient(
+            auth, http, max_rate=max_rate, max_concurrency=max_concurrency
+        )
+        yield SpotifyContext(http=http, auth=auth, client=client)
+    finally:
+        await http.aclose()
@@ -0,0 +1,42 @@
+"""Shared HTTP connection pool.
+
+One httpx.AsyncClient is reused by the auth and API layers so TCP/TLS
+connections to Spotify are kept alive between calls instead of being
+re-established per request. HTTP/2 is enabled, so concurrent requests
+(e.g. several `search` or `get_playlist_tracks` calls under
+`asyncio.gather`) are multiplexed over a single TLS connection.
+"""
+
+from __future__ import annotations
+
+import socket
+
+import httpx
+
+DEFAULT_TIMEOUT = 30.0
+
+# TCP keepalive stops idle pooled connections from being silently dropped
+# by NAT/load balancers between requests (e.g. on Cloud Run)
+_SOCKET_OPTIONS = [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+
+
+def create_http(
+    timeout: float = DEFAULT_TIMEOUT, max_connections: int = 100
+) -> httpx.AsyncClient:
+    """Create the pooled httpx.AsyncClient shared by auth and API calls.
+
+    The caller owns the client and must `aclose()` it on shutdown.
+    """
+    transport = httpx.AsyncHTTPTransport(
+        http2=True,
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            # Enough idle connections to absorb a gather() fan-out without
+            # re-handshaking; long expiry bridges gaps between tool calls
+            max_keepalive_connections=50,
+            keepalive_expiry=300,
+        ),
+        retries=0,  # SpotifyClient does its own status-aware retries
+        socket_options=_SOCKET_OPTIONS,
+    )
+    return httpx.AsyncClient(timeout=timeout, transport=transport)
@@ -6,13 +6,43 @@ Supports Streamable HTTP transport for Cloud Run deployment.
 
 from __future__ import annotations
 
+import asyncio
+import logging
 import os
-from typing import Optional
+import re
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any
 
-from mcp.server.fastmcp import FastMCP
+import anyio
+from mcp.server.fastmcp import Context, FastMCP
 
 from .auth import SpotifyAuthError
-from .client import SpotifyAPIError, get_client
+from .client import SpotifyAPIError, SpotifyClient
+from .context import SpotifyContext, lifespan
+
+logger = logging.getLogger(__name__)
+
+# Spotify resources for the current `main()` run. Held here rather than in
+# the FastMCP lifespan because with stateless_http=True that lifespan is
+# entered once per request, which would drop the connection pool and the
+# cached access token after every tool call.
+_spotify: SpotifyContext | None = None
+
+
+@asynccontextmanager
+async def _session_lifespan(_: FastMCP) -> AsyncIterator[SpotifyContext]:
+    """Inject the app-scoped SpotifyContext into each MCP session.
+
+    Falls back to a session-owned context when the server is started
+    without `main()` (e.g. via `mcp dev`).
+    """
+    if _spotify is not None:
+        yield _spotify
+    else:
+        async with lifespan() as spotify:
+            yield spotify
+
 
 # Create MCP server instance
 # stateless_http=True and json_response=True are recommended for Cloud Run
@@ -21,18 +51,71 @@ mcp = FastMCP(
     "spotify",
     stateless_http=True,
     json_response=True,
+    lifespan=_session_lifespan,
 )
 
 
+# "from_token" resolves to the user's market and makes Spotify omit the
+# per-item available_markets arrays (up to ~180 entries each) from search
+_SEARCH_MARKET = "from_token"
+
+_TRACK_PREFIX = "spotify:track:"
+
+# Splits spotify_search's comma-separated types, tolerating stray whitespace
+_TYPE_SPLIT = re.compile(r"\s*,\s*")
+
+# Largest page Spotify accepts for search, playlists and recently played;
+# anything bigger is a 400, so clamp locally instead of spending a round trip
+_MAX_PAGE_LIMIT = 50
+
+# Only the fields _format_track renders; trims playlist payloads considerably
+_PLAYLIST_TRACK_FIELDS = "items(track(name,uri,duration_ms,artists(name),album(name)))"
+
+
+def _client(ctx: Context) -> SpotifyClient:
+    """Get the SpotifyClient injected through the server lifespan."""
+    return ctx.request_context.lifespan_context.client
+
+
+def _format_duration(ms: int) -> str:
+    """Format a millisecond duration as m:ss."""
+    minutes, seconds = divmod(ms // 1000, 60)
+    return f"{minutes}:{seconds:02d}"
+
+
 def _format_track(track: dict) -> str:
     """Format a track for display."""
-    artists = ", ".join(a["name"] for a in track.get("artists", []))
-    album = track.get("album", {}).get("name", "Unknown Album")
-    duration_ms = track.get("duration_ms", 0)
-    duration = f"{duration_ms // 60000}:{(duration_ms % 60000) // 1000:02d}"
+    artists = ", ".join(a["name"] for a in track.get("artists") or ())
+    album = (track.get("album") or {}).get("name", "Unknown Album")
+    duration = _format_duration(track.get("duration_ms") or 0)
     return f'"{track.get("name")}" by {artists} ({album}) [{duration}]'
 
 
+def _track_item(track: dict) -> dict[str, Any]:
+    """Structured form of a track for tools that return JSON."""
+    return {"uri": track.get("uri"), "summary": _format_track(track)}
+
+
+async def _resolve_device(client: SpotifyClient, device_id: str | None) -> str | None:
+    """Pick a device for play/queue commands when none was given.
+
+    Spotify rejects those commands with 404 when no device is active, so
+    fall back to the first available one. Returns None if a device is
+    already active (Spotify targets it by default) or if the device lookup
+    fails, so a devices error never breaks the command itself.
+    """
+    if device_id:
+        return device_id
+    try:
+        devices = (await client.get_devices()).get("devices", [])
+    except Exception as e:
+        logger.warning("Device lookup failed, using Spotify's default: %s", e)
+        return None
+    if not devices or any(d.get("is_active") for d in devices):
+        return None
+    return devices[0].get("id")
+
+
 def _format_error(e: Exception) -> str:
     """Format an error for the LLM."""
     if isinstance(e, SpotifyAuthError):
@@ -48,14 +131,14 @@ def _format_error(e: Exception) -> str:
 
 
 @mcp.tool("spotify_get_playback")
-async def get_playback() -> str:
+async def get_playback(ctx: Context) -> str:
     """Get current Spotify playback state including track, device, and progress.
 
     Use this to see what's currently playing, check if music is paused,
     or find available devices.
     """
     try:
-        client = get_client()
+        client = _client(ctx)
         playback = await client.get_current_playback()
 
         if not playback:
@@ -69,7 +152,7 @@ async def get_playback() -> str:
         repeat = playback.get("repeat_state", "off")
 
         status = "Playing" if is_playing else "Paused"
-        progress = f"{progress_ms // 60000}:{(progress_ms % 60000) // 1000:02d}"
+        progress = _format_duration(progress_ms or 0)
 
         lines = [
             f"Status: {status}",
@@ -89,9 +172,10 @@ async def get_playback() -> str:
 
 @mcp.tool("spotify_play")
 async def play(
-    query: Optional[str] = None,
-    uri: Optional[str] = None,
-    device_id: Optional[str] = None,
+    ctx: Context,
+    query: str | None = None,
+    uri: str | None = None,
+    device_id: str | None = None,
 ) -> str:
     """Start or resume Spotify playback.
 
@@ -100,11 +184,14 @@ async def play(
     If neither, resumes current playback.
     """
     try:
-        client = get_client()
+        client = _client(ctx)
 
         if query:
-            # Search and play
-            results = await client.search(query, types=["track"], limit=1)
+            # Search and play, resolving the device concurrently
+            results, device_id = await asyncio.gather(
+                client.search(query, types=["track"], limit=1, market=_SEARCH_MARKET),
+                _resolve_device(client, device_id),
+            )
             tracks = results.get("tracks", {}).get("items", [])
             if not tracks:
                 return f"No tracks found for '{query}'."
@@ -114,7 +201,8 @@ async def play(
 
         elif uri:
             # Play specific URI
-            if uri.startswith("spotify:track:"):
+            device_id = await _resolve_device(client, device_id)
+            if uri.startswith(_TRACK_PREFIX):
                 await client.play(device_id=device_id, uris=[uri])
             else:
                 await client.play(device_id=device_id, context_uri=uri)
@@ -122,6 +210,7 @@ async def play(
 
         else:
             # Resume playback
+            device_id = await _resolve_device(client, device_id)
             await client.play(device_id=device_id)
             return "Resumed playback."
 
@@ -130,10 +219,10 @@ async def play(
 
 
 @mcp.tool("spotify_pause")
-async def pause() -> str:
+async def pause(ctx: Context) -> str:
     """Pause Spotify playback."""
     try:
-        client = get_client()
+        client = _client(ctx)
         await client.pause()
         return "Playback paused."
     except Exception as e:
@@ -141,10 +230,10 @@ async def pause() -> str:
 
 
 @mcp.tool("spotify_next")
-async def next_track() -> str:
+async def next_track(ctx: Context) -> str:
     """Skip to the next track."""
     try:
-        client = get_client()
+        client = _client(ctx)
         await client.skip_to_next()
         return "Skipped to next track."
     except Exception as e:
@@ -152,10 +241,10 @@ async def next_track() -> str:
 
 
 @mcp.tool("spotify_previous")
-async def previous_track() -> str:
+async def previous_track(ctx: Context) -> str:
     """Skip to the previous track."""
     try:
-        client = get_client()
+        client = _client(ctx)
         await client.skip_to_previous()
         return "Skipped to previous track."
     except Exception as e:
@@ -163,10 +252,10 @@ async def previous_track() -> str:
 
 
 @mcp.tool("spotify_volume")
-async def set_volume(volume: int) -> str:
+async def set_volume(ctx: Context, volume: int) -> str:
     """Set playback volume (0-100)."""
     try:
-        client = get_client()
+        client = _client(ctx)
         clamped = max(0, min(100, volume))
         await client.set_volume(clamped)
         return f"Volume set to {clamped}%."
@@ -175,10 +264,10 @@ async def set_volume(volume: int) -> str:
 
 
 @mcp.tool("spotify_shuffle")
-async def set_shuffle(enabled: bool) -> str:
+async def set_shuffle(ctx: Context, enabled: bool) -> str:
     """Enable or disable shuffle mode."""
     try:
-        client = get_client()
+        client = _client(ctx)
         await client.set_shuffle(enabled)
         return f"Shuffle {'enabled' if enabled else 'disabled'}."
     except Exception as e:
@@ -186,10 +275,10 @@ async def set_shuffle(enabled: bool) -> str:
 
 
 @mcp.tool("spotify_repeat")
-async def set_repeat(mode: str = "off") -> str:
+async def set_repeat(ctx: Context, mode: str = "off") -> str:
     """Set repeat mode: 'track', 'context' (album/playlist), or 'off'."""
     try:
-        client = get_client()
+        client = _client(ctx)
         if mode not in ("track", "context", "off"):
             return "Invalid mode. Use 'track', 'context', or 'off'."
         await client.set_repeat(mode)
@@ -199,25 +288,31 @@ async def set_repeat(mode: str = "off") -> str:
 
 
 @mcp.tool("spotify_queue_add")
-async def add_to_queue(query: Optional[str] = None, uri: Optional[str] = None) -> str:
+async def add_to_queue(
+    ctx: Context, query: str | None = None, uri: str | None = None
+) -> str:
     """Add a track to the playback queue.
 
     Provide either a search query or a Spotify URI.
     """
     try:
-        client = get_client()
+        client = _client(ctx)
 
         if query:
-            results = await client.search(query, types=["track"], limit=1)
+            results, device_id = await asyncio.gather(
+                client.search(query, types=["track"], limit=1, market=_SEARCH_MARKET),
+                _resolve_device(client, None),
+            )
             tracks = results.get("tracks", {}).get("items", [])
             if not tracks:
                 return f"No tracks found for '{query}'."
             track = tracks[0]
-            await client.add_to_queue(track["uri"])
+            await client.add_to_queue(track["uri"], device_id=device_id)
             return f"Added to queue: {_format_track(track)}"
 
         elif uri:
-            await client.add_to_queue(uri)
+            device_id = await _resolve_device(client, None)
+            await client.add_to_queue(uri, device_id=device_id)
             return f"Added to queue: {uri}"
 
         else:
@@ -227,70 +322,109 @@ async def add_to_queue(query: Optional[str] = None, uri: Optional[str] = None) -
         return _format_error(e)
 
 
+@mcp.tool("spotify_queue_add_many")
+async def add_many_to_queue(ctx: Context, queries: list[str]) -> str:
+    """Add several tracks to the playback queue, one search query per track.
+
+    Searches run concurrently; tracks are queued in the order given.
+    """
+    try:
+        client = _client(ctx)
+        if not queries:
+            return "Provide at least one query to add to queue."
+
+        searches = asyncio.gather(
+            *(
+                client.search(q, types=["track"], limit=1, market=_SEARCH_MARKET)
+                for q in queries
+            ),
+            return_exceptions=True,
+        )
+        results, device_id = await asyncio.gather(
+            searches, _resolve_device(client, None)
+        )
+
+        # Queue sequentially: concurrent adds would land in arbitrary order
+        lines = []
+        for query, result in zip(queries, results):
+            if isinstance(result, Exception):
+                lines.append(f"- '{query}': {_format_error(result)}")
+                continue
+            tracks = result.get("tracks", {}).get("items", [])
+            if not tracks:
+                lines.append(f"- No tracks found for '{query}'.")
+                continue
+            try:
+                await client.add_to_queue(tracks[0]["uri"], device_id=device_id)
+                lines.append(f"- Added: {_format_track(tracks[0])}")
+            except Exception as e:
+                lines.append(f"- '{query}': {_format_error(e)}")
+
+        return "\n".join(lines)
+
+    except Exception as e:
+        return _format_error(e)
+
+
 @mcp.tool("spotify_queue")
-async def get_queue() -> str:
-    """Get the current playback queue."""
+async def get_queue(ctx: Context) -> dict[str, Any]:
+    """Get the current playback queue (the next 10 tracks)."""
     try:
-        client = get_client()
+        client = _client(ctx)
         queue = await client.get_queue()
 
         currently_playing = queue.get("currently_playing")
         upcoming = queue.get("queue", [])
 
-        lines = []
-        if currently_playing:
-            lines.append(f"Now playing: {_format_track(currently_playing)}")
-        else:
-            lines.append("Nothing currently playing.")
-
-        if upcoming:
-            lines.append(f"\nUp next ({len(upcoming)} tracks):")
-            for i, track in enumerate(upcoming[:10], 1):
-                lines.append(f"  {i}. {_format_track(track)}")
-            if len(upcoming) > 10:
-                lines.append(f"  ... and {len(upcoming) - 10} more")
-        else:
-            lines.append("Queue is empty.")
-
-        return "\n".join(lines)
+        return {
+            "now_playing": _track_item(currently_playing)
+            if currently_playing
+            else None,
+            "queue": [_track_item(t) for t in upcoming[:10]],
+            "queue_total": len(upcoming),
+        }
 
     except Exception as e:
-        return _format_error(e)
+        return {"error": _format_error(e)}
 
 
 @mcp.tool("spotify_devices")
-async def get_devices() -> str:
+async def get_devices(ctx: Context) -> dict[str, Any]:
     """List available Spotify playback devices."""
     try:
-        client = get_client()
+        client = _client(ctx)
         result = await client.get_devices()
-        devices = result.get("devices", [])
+        devices = [
+            {
+                "id": d.get("id"),
+                "name": d.get("name"),
+                "type": d.get("type"),
+                "is_active": bool(d.get("is_active")),
+                "volume_percent": d.get("volume_percent"),
+            }
+            for d in result.get("devices", [])
+        ]
 
         if not devices:
-            return "No active Spotify devices found. Open Spotify on a device first."
-
-        lines = ["Available devices:"]
-        for d in devices:
-            active = " [ACTIVE]" if d.get("is_active") else ""
-            lines.append(
-                f"- {d.get('name')} ({d.get('type')}){active} "
-                f"Volume: {d.get('volume_percent')}% | ID: {d.get('id')}"
-            )
-
-        return "\n".join(lines)
+            return {
+                "devices": [],
+                "message": "No active Spotify devices found. "
+                "Open Spotify on a device first.",
+            }
+        return {"devices": devices}
 
     except Exception as e:
-        return _format_error(e)
+        return {"error": _format_error(e)}
 
 
 @mcp.tool("spotify_transfer")
-async def transfer_playback(device_id: str, play: bool = True) -> str:
+async def transfer_playback(ctx: Context, device_id: str, play: bool = True) -> str:
     """Transfer playback to another device.
 
     Use spotify_devices to find device IDs.
     """
     try:
-        client = get_client()
+        client = _client(ctx)
         await client.transfer_playback(device_id, play=play)
         return f"Playback transferred to device {device_id}."
     except Exception as e:
@@ -302,60 +436,68 @@ async def transfer_playback(device_id: str, play: bool = True) -> str:
 # ─────────────────────────────────────────────────────────────────────────────
 
 
+def _render_search_album(album: dict) -> dict[str, Any]:
+    artists = ", ".join(a["name"] for a in album.get("artists", []))
+    return {"uri": album["uri"], "summary": f'"{album["name"]}" by {artists}'}
+
+
+def _render_search_artist(artist: dict) -> dict[str, Any]:
+    followers = artist.get("followers", {}).get("total", 0)
+    return {
+        "uri": artist["uri"],
+        "summary": f"{artist['name']} ({followers:,} followers)",
+    }
+
+
+def _render_search_playlist(playlist: dict) -> dict[str, Any]:
+    owner = playlist.get("owner", {}).get("display_name", "Unknown")
+    return {"uri": playlist["uri"], "summary": f'"{playlist["name"]}" by {owner}'}
+
+
+# search type -> (results key, per-item renderer)
+_SEARCH_RENDERERS = {
+    "track": ("tracks", _track_item),
+    "album": ("albums", _render_search_album),
+    "artist": ("artists", _render_search_artist),
+    "playlist": ("playlists", _render_search_playlist),
+}
+
+
 @mcp.tool("spotify_search")
 async def search(
+    ctx: Context,
     query: str,
     types: str = "track",
     limit: int = 10,
-) -> str:
+) -> dict[str, Any]:
     """Search Spotify for tracks, albums, artists, or playlists.
 
     types: comma-separated list like "track,album,artist,playlist"
     """
     try:
-        client = get_client()
-        type_list = [t.strip() for t in types.split(",")]
-        results = await client.search(query, types=type_list, limit=limit)
-
-        lines = [f"Search results for '{query}':"]
-
-        if "tracks" in results:
-            tracks = results["tracks"].get("items", [])
-            if tracks:
-                lines.append(f"\nTracks ({len(tracks)}):")
-                for t in tracks[:limit]:
-                    lines.append(f"  - {_format_track(t)} | URI: {t['uri']}")
-
-        if "albums" in results:
-            albums = results["albums"].get("items", [])
-            if albums:
-                lines.append(f"\nAlbums ({len(albums)}):")
-                for a in albums[:limit]:
-                    artists = ", ".join(art["name"] for art in a.get("artists", []))
-                    lines.append(f'  - "{a["name"]}" by {artists} | URI: {a["uri"]}')
-
-        if "artists" in results:
-            artists = results["artists"].get("items", [])
-            if artists:
-                lines.append(f"\nArtists ({len(artists)}):")
-                for a in artists[:limit]:
-                    followers = a.get("followers", {}).get("total", 0)
-                    lines.append(
-                        f"  - {a['name']} ({followers:,} followers) | URI: {a['uri']}"
-                    )
-
-        if "playlists" in results:
-            playlists = results["playlists"].get("items", [])
-            if playlists:
-                lines.append(f"\nPlaylists ({len(playlists)}):")
-                for p in playlists[:limit]:
-                    owner = p.get("owner", {}).get("display_name", "Unknown")
-                    lines.append(f'  - "{p["name"]}" by {owner} | URI: {p["uri"]}')
+        limit = max(1, min(_MAX_PAGE_LIMIT, limit))
+        client = _client(ctx)
+        # Deduplicated once so the request and the rendering agree
+        type_list = list(dict.fromkeys(_TYPE_SPLIT.split(types.strip())))
+        results = await client.search(
+            query, types=type_list, limit=limit, market=_SEARCH_MARKET
+        )
 
-        return "\n".join(lines)
+        response: dict[str, Any] = {"query": query}
+        for search_type in type_list:
+            renderer = _SEARCH_RENDERERS.get(search_type)
+            if renderer is None:
+                continue
+            key, render = renderer
+            # Spotify may return null entries (notably for playlists)
+            items = [i for i in results.get(key, {}).get("items", []) if i]
+            if items:
+                response[key] = [render(item) for item in items[:limit]]
+
+        return response
 
     except Exception as e:
-        return _format_error(e)
+        return {"error": _format_error(e)}
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -364,61 +506,55 @@ async def search(
 
 
 @mcp.tool("spotify_my_playlists")
-async def my_playlists(limit: int = 20) -> str:
+async def my_playlists(ctx: Context, limit: int = 20) -> dict[str, Any]:
     """Get the user's playlists."""
     try:
-        client = get_client()
+        limit = max(1, min(_MAX_PAGE_LIMIT, limit))
+        client = _client(ctx)
         result = await client.get_my_playlists(limit=limit)
-        playlists = result.get("items", [])
-
-        if not playlists:
-            return "You have no playlists."
 
-        lines = [f"Your playlists ({len(playlists)}):"]
-        for p in playlists:
+        playlists = []
+        for p in result.get("items", []):
             track_count = p.get("tracks", {}).get("total", 0)
-            lines.append(f'- "{p["name"]}" ({track_count} tracks) | URI: {p["uri"]}')
-
-        return "\n".join(lines)
+            playlists.append(
+                {"uri": p["uri"], "summary": f'"{p["name"]}" ({track_count} tracks)'}
+            )
+        return {"playlists": playlists}
 
     except Exception as e:
-        return _format_error(e)
+        return {"error": _format_error(e)}
 
 
 @mcp.tool("spotify_recently_played")
-async def recently_played(limit: int = 20) -> str:
+async def recently_played(ctx: Context, limit: int = 20) -> dict[str, Any]:
     """Get recently played tracks."""
     try:
-        client = get_client()
+        limit = max(1, min(_MAX_PAGE_LIMIT, limit))
+        client = _client(ctx)
         result = await client.get_recently_played(limit=limit)
-        items = result.get("items", [])
-
-        if not items:
-            return "No recently played tracks."
 
-        lines = ["Recently played:"]
-        for item in items:
-            track = item.get("track", {})
-            played_at = item.get("played_at", "")[:10]  # Just the date
-            lines.append(f"- {_format_track(track)} (played {played_at})")
-
-        return "\n".join(lines)
+        tracks = []
+        for item in result.get("items", []):
+            track = _track_item(item.get("track", {}))
+            track["played_at"] = item.get("played_at", "")[:10]  # Just the date
+            tracks.append(track)
+        return {"tracks": tracks}
 
     except Exception as e:
-        return _format_error(e)
+        return {"error": _format_error(e)}
 
 
 @mcp.tool("spotify_like_track")
-async def like_track(uri: Optional[str] = None) -> str:
+async def like_track(ctx: Context, uri: str | None = None) -> str:
     """Save the current track (or specified track) to your library.
 
     If uri is not provided, likes the currently playing track.
     """
     try:
-        client = get_client()
+        client = _client(ctx)
 
         if uri:
-            track_id = uri.replace("spotify:track:", "")
+            track_id = uri.removeprefix(_TRACK_PREFIX)
         else:
             playback = await client.get_current_playback()
             if not playback or not playback.get("item"):
@@ -438,7 +574,7 @@ async def like_track(uri: Optional[str] = None) -> str:
 
 
 @mcp.tool("spotify_get_playlist_tracks")
-async def get_playlist_tracks(playlist_id: str, limit: int = 50) -> str:
+async def get_playlist_tracks(ctx: Context, playlist_id: str, limit: int = 50) -> str:
     """Get tracks from a Spotify playlist.
 
     Args:
@@ -446,7 +582,7 @@ async def get_playlist_tracks(playlist_id: str, limit: int = 50) -> str:
         limit: Maximum tracks to return (default 50, max 100)
     """
     try:
-        client = get_client()
+        client = _client(ctx)
 
         # Normalize playlist ID
         if playlist_id.startswith("spotify:playlist:"):
@@ -454,10 +590,12 @@ async def get_playlist_tracks(playlist_id: str, limit: int = 50) -> str:
         elif "open.spotify.com/playlist/" in playlist_id:
             playlist_id = playlist_id.split("/playlist/")[-1].split("?")[0]
 
-        playlist = await client.get_playlist(playlist_id)
+        playlist = await client.get_playlist(playlist_id, fields="name")
         playlist_name = playlist.get("name", "Unknown Playlist")
 
-        result = await client.get_playlist_tracks(playlist_id, limit=min(limit, 100))
+        result = await client.get_playlist_tracks(
+            playlist_id, limit=min(limit, 100), fields=_PLAYLIST_TRACK_FIELDS
+        )
         items = result.get("items", [])
 
         if not items:
@@ -477,6 +615,7 @@ async def get_playlist_tracks(playlist_id: str, limit: int = 50) -> str:
 
 @mcp.tool("spotify_create_playlist")
 async def create_playlist(
+    ctx: Context,
     name: str,
     description: str = "",
     public: bool = False,
@@ -489,7 +628,7 @@ async def create_playlist(
         public: Whether the playlist should be public (default: False)
     """
     try:
-        client = get_client()
+        client = _client(ctx)
         user = await client.get_me()
         user_id = user.get("id")
 
@@ -515,7 +654,7 @@ async def create_playlist(
 
 
 @mcp.tool("spotify_delete_playlist")
-async def delete_playlist(playlist_id: str) -> str:
+async def delete_playlist(ctx: Context, playlist_id: str) -> str:
     """Delete (unfollow) a Spotify playlist.
 
     If you own the playlist, it will be deleted. If you don't own it,
@@ -525,7 +664,7 @@ async def delete_playlist(playlist_id: str) -> str:
         playlist_id: Spotify playlist ID or URI
     """
     try:
-        client = get_client()
+        client = _client(ctx)
 
         # Normalize playlist ID
         if playlist_id.startswith("spotify:playlist:"):
@@ -534,7 +673,7 @@ async def delete_playlist(playlist_id: str) -> str:
             playlist_id = playlist_id.split("/playlist/")[-1].split("?")[0]
 
         # Get playlist name first
-        playlist = await client.get_playlist(playlist_id)
+        playlist = await client.get_playlist(playlist_id, fields="name")
         playlist_name = playlist.get("name", "Unknown")
 
         await client.unfollow_playlist(playlist_id)
@@ -546,6 +685,7 @@ async def delete_playlist(playlist_id: str) -> str:
 
 @mcp.tool("spotify_add_tracks_to_playlist")
 async def add_tracks_to_playlist(
+    ctx: Context,
     playlist_id: str,
     track_uris: list[str],
 ) -> str:
@@ -556,7 +696,7 @@ async def add_tracks_to_playlist(
         track_uris: List of track URIs to add (e.g., ["spotify:track:xxx", ...])
     """
     try:
-        client = get_client()
+        client = _client(ctx)
 
         # Normalize playlist ID
         if playlist_id.startswith("spotify:playlist:"):
@@ -567,14 +707,14 @@ async def add_tracks_to_playlist(
         # Normalize track URIs
         normalized_uris = []
         for uri in track_uris:
-            if uri.startswith("spotify:track:"):
+            if uri.startswith(_TRACK_PREFIX):
                 normalized_uris.append(uri)
             elif "open.spotify.com/track/" in uri:
                 track_id = uri.split("/track/")[-1].split("?")[0]
-                normalized_uris.append(f"spotify:track:{track_id}")
+                normalized_uris.append(_TRACK_PREFIX + track_id)
             else:
                 # Assume it's just an ID
-                normalized_uris.append(f"spotify:track:{uri}")
+                normalized_uris.append(_TRACK_PREFIX + uri)
 
         await client.add_tracks_to_playlist(playlist_id, normalized_uris)
         return f"Added {len(normalized_uris)} track(s) to playlist."
@@ -589,14 +729,14 @@ async def add_tracks_to_playlist(
 
 
 @mcp.tool("spotify_get_saved_tracks")
-async def get_saved_tracks(limit: int = 50) -> str:
+async def get_saved_tracks(ctx: Context, limit: int = 50) -> str:
     """Get the user's saved (liked) tracks.
 
     Args:
         limit: Maximum tracks to return (default 50, max 50)
     """
     try:
-        client = get_client()
+        client = _client(ctx)
         result = await client.get_saved_tracks(limit=min(limit, 50))
         items = result.get("items", [])
 
@@ -618,7 +758,8 @@ async def get_saved_tracks(limit: int = 50) -> str:
 
 @mcp.tool("spotify_play_liked_songs")
 async def play_liked_songs(
-    device_id: Optional[str] = None,
+    ctx: Context,
+    device_id: str | None = None,
     shuffle: bool = True,
 ) -> str:
     """Play the user's Liked Songs collection.
@@ -631,7 +772,7 @@ async def play_liked_songs(
         shuffle: Whether to shuffle (default True)
     """
     try:
-        client = get_client()
+        client = _client(ctx)
 
         # Get saved tracks (up to 50)
         result = await client.get_saved_tracks(limit=50)
@@ -653,6 +794,7 @@ async def play_liked_songs(
             random.shuffle(uris)
 
         # Play the tracks
+        device_id = await _resolve_device(client, device_id)
         await client.play(device_id=device_id, uris=uris)
 
         return f"Now playing your Liked Songs ({len(uris)} tracks, shuffle={'on' if shuffle else 'off'})"
@@ -667,7 +809,9 @@ async def play_liked_songs(
 
 
 @mcp.tool("spotify_seek")
-async def seek_position(position_ms: int, device_id: Optional[str] = None) -> str:
+async def seek_position(
+    ctx: Context, position_ms: int, device_id: str | None = None
+) -> str:
     """Seek to a position in the currently playing track.
 
     Args:
@@ -675,12 +819,10 @@ async def seek_position(position_ms: int, device_id: Optional[str] = None) -> st
         device_id: Optional device ID
     """
     try:
-        client = get_client()
+        client = _client(ctx)
         await client.seek(position_ms, device_id=device_id)
 
-        minutes = position_ms // 60000
-        seconds = (position_ms % 60000) // 1000
-        return f"Seeked to {minutes}:{seconds:02d}"
+        return f"Seeked to {_format_duration(position_ms)}"
 
     except Exception as e:
         return _format_error(e)
@@ -688,8 +830,9 @@ async def seek_position(position_ms: int, device_id: Optional[str] = None) -> st
 
 @mcp.tool("spotify_play_context")
 async def play_context(
+    ctx: Context,
     context_uri: str,
-    device_id: Optional[str] = None,
+    device_id: str | None = None,
 ) -> str:
     """Play a Spotify playlist, album, or artist.
 
@@ -702,7 +845,7 @@ async def play_context(
         device_id: Optional device to play on
     """
     try:
-        client = get_client()
+        client = _client(ctx)
 
         # Normalize URI from URL if needed
         if "open.spotify.com/" in context_uri:
@@ -716,6 +859,7 @@ async def play_context(
                 id_part = context_uri.split("/artist/")[-1].split("?")[0]
                 context_uri = f"spotify:artist:{id_part}"
 
+        device_id = await _resolve_device(client, device_id)
         await client.play(device_id=device_id, context_uri=context_uri)
 
         # Try to get context name
@@ -731,9 +875,45 @@ async def play_context(
 # ─────────────────────────────────────────────────────────────────────────────
 
 
+# Longest startup will wait on the prewarm request before serving anyway
+_PREWARM_TIMEOUT = 5.0
+
+
+async def _prewarm(spotify: SpotifyContext) -> None:
+    """Refresh the token and open pooled connections before serving.
+
+    A cheap GET /me pays the DNS, TLS and OAuth refresh cost up front so the
+    first tool call doesn't. Failures are logged, not fatal: tools report
+    auth errors themselves. The wait is capped so a rate-limited or failing
+    Spotify can't hold up startup through the client's retry backoff.
+    """
+    try:
+        await asyncio.wait_for(spotify.client.get_me(), _PREWARM_TIMEOUT)
+    except TimeoutError:
+        logger.warning("Spotify prewarm timed out after %ss", _PREWARM_TIMEOUT)
+    except Exception as e:
+        logger.warning("Spotify prewarm failed: %s", e)
+
+
+async def _serve(transport: str) -> None:
+    """Run the MCP transport inside an app-scoped SpotifyContext."""
+    global _spotify
+    async with lifespan() as spotify:
+        _spotify = spotify
+        await _prewarm(spotify)
+        try:
+            if transport == "http":
+                await mcp.run_streamable_http_async()
+            else:
+                await mcp.run_stdio_async()
+        finally:
+            _spotify = None
+
+
 def main():
     """Run the MCP server."""
     transport = os.environ.get("MCP_TRANSPORT", "stdio")
+    backend_options: dict[str, bool] = {}
 
     if transport == "http":
         # For Cloud Run: run with streamable HTTP transport
@@ -741,10 +921,17 @@ def main():
         port = int(os.environ.get("PORT", "8080"))
         mcp.settings.host = "0.0.0.0"
         mcp.settings.port = port
-        mcp.run(transport="streamable-http")
-    else:
-        # For local development: use stdio
-        mcp.run()
+        # uvloop's libuv event loop handles many concurrent connections more
+        # cheaply than the stock asyncio loop; it isn't available on Windows
+        try:
+            import uvloop  # noqa: F401
+        except ImportError:
+            pass
+        else:
+            backend_options["use_uvloop"] = True
+    # Otherwise stdio, for local development
+
+    anyio.run(_serve, transport, backend_options=backend_options)
 
 
 if __name__ == "__main__":
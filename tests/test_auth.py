@@ -0,0 +1,54 @@
+"""SpotifyAuth token refresh single-flight."""
+
+import asyncio
+
+import httpx
+import pytest
+
+from spotify_mcp.auth import SpotifyAuth, SpotifyAuthError
+
+
+def make_auth(handler) -> SpotifyAuth:
+    http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return SpotifyAuth(
+        http, client_id="id", client_secret="secret", refresh_token="refresh"
+    )
+
+
+async def test_concurrent_callers_share_one_refresh():
+    refreshes = 0
+
+    async def handler(request):
+        nonlocal refreshes
+        refreshes += 1
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, json={"access_token": "tok", "expires_in": 3600})
+
+    auth = make_auth(handler)
+    tokens = await asyncio.gather(*(auth.get_access_token() for _ in range(5)))
+
+    assert refreshes == 1
+    assert tokens == ["tok"] * 5
+    assert await auth.get_auth_header() == "Bearer tok"
+
+
+async def test_failed_refresh_raises_in_every_waiter():
+    refreshes = 0
+
+    async def handler(request):
+        nonlocal refreshes
+        refreshes += 1
+        await asyncio.sleep(0.05)
+        return httpx.Response(400, json={"error": "invalid_grant"})
+
+    auth = make_auth(handler)
+    results = await asyncio.gather(
+        *(auth.get_access_token() for _ in range(3)), return_exceptions=True
+    )
+
+    assert refreshes == 1
+    assert all(isinstance(r, SpotifyAuthError) for r in results)
+    # The failed task is cleared, so the next caller retries the refresh
+    with pytest.raises(SpotifyAuthError):
+        await auth.get_access_token()
+    assert refreshes == 2
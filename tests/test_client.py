@@ -0,0 +1,148 @@
+"""SpotifyClient caching, single-flight and retry behaviour."""
+
+import asyncio
+
+import httpx
+import pytest
+
+from spotify_mcp.client import SpotifyAPIError, SpotifyClient
+
+
+class FakeAuth:
+    async def get_auth_header(self) -> str:
+        return "Bearer test"
+
+
+def make_client(handler, **kwargs) -> SpotifyClient:
+    http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return SpotifyClient(FakeAuth(), http, max_rate=1000, **kwargs)
+
+
+async def test_concurrent_identical_gets_share_one_request():
+    calls = []
+
+    async def handler(request):
+        calls.append(request.url.path)
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, json={"is_playing": True})
+
+    client = make_client(handler)
+    results = await asyncio.gather(*(client.get("/me/player") for _ in range(5)))
+
+    assert calls == ["/v1/me/player"]
+    assert all(r == {"is_playing": True} for r in results)
+
+
+async def test_read_overlapping_a_write_is_not_joined_or_cached():
+    playlists = ["a"]
+    gets = 0
+
+    async def handler(request):
+        nonlocal gets
+        if request.method == "POST":
+            await asyncio.sleep(0.2)
+            playlists.append("b")
+            return httpx.Response(201, json={"id": "b"})
+        gets += 1
+        snapshot = list(playlists)
+        # The first read outlasts the write, so it completes after the
+        # write's own invalidation has already run
+        await asyncio.sleep(0.3 if gets == 1 else 0.05)
+        return httpx.Response(200, json={"items": snapshot})
+
+    client = make_client(handler)
+    before = asyncio.create_task(client.get_my_playlists())
+    await asyncio.sleep(0.01)
+    write = asyncio.create_task(client.create_playlist("user", "new"))
+    await asyncio.sleep(0.01)
+    # Issued while the write is in flight: must not join the earlier read
+    during = await client.get_my_playlists()
+    await write
+    assert await before == {"items": ["a"]}
+
+    assert gets == 2
+    assert during == {"items": ["a"]}
+    # Neither overlapping read was cached, so the new playlist shows up
+    assert await client.get_my_playlists() == {"items": ["a", "b"]}
+    assert gets == 3
+
+
+async def test_429_with_retry_after_retries_gets():
+    statuses = iter([429, 200])
+
+    def handler(request):
+        status = next(statuses)
+        if status == 429:
+            return httpx.Response(429, headers={"Retry-After": "0"})
+        return httpx.Response(200, json={"id": "track"})
+
+    client = make_client(handler)
+
+    assert await client.get("/tracks/1") == {"id": "track"}
+
+
+async def test_429_is_not_retried_for_writes():
+    calls = 0
+
+    def handler(request):
+        nonlocal calls
+        calls += 1
+        return httpx.Response(429, headers={"Retry-After": "0"})
+
+    client = make_client(handler)
+
+    with pytest.raises(SpotifyAPIError) as exc_info:
+        await client.post("/me/player/next")
+    assert exc_info.value.status_code == 429
+    assert calls == 1
+
+
+async def test_stream_playlist_tracks_pages_until_a_short_page():
+    offsets = []
+
+    def handler(request):
+        offset = int(request.url.params["offset"])
+        offsets.append(offset)
+        count = 2 if offset < 4 else 1
+        items = [
+            {"track": {"uri": f"spotify:track:{offset + i}"}} for i in range(count)
+        ]
+        return httpx.Response(200, json={"items": items, "total": 5})
+
+    client = make_client(handler)
+    items = [i async for i in client.stream_playlist_tracks("p", page_size=2)]
+
+    assert offsets == [0, 2, 4]
+    assert [i["track"]["uri"] for i in items] == [
+        f"spotify:track:{n}" for n in range(5)
+    ]
+
+
+async def test_stream_playlist_tracks_raises_on_error_page():
+    def handler(request):
+        if request.url.params["offset"] == "0":
+            return httpx.Response(200, json={"items": [{"track": None}] * 2})
+        return httpx.Response(404, json={"error": {"message": "Not found"}})
+
+    client = make_client(handler)
+    items = []
+
+    with pytest.raises(SpotifyAPIError) as exc_info:
+        async for item in client.stream_playlist_tracks("p", page_size=2):
+            items.append(item)
+    assert exc_info.value.status_code == 404
+    assert exc_info.value.message == "Not found"
+    assert len(items) == 2
+
+
+async def test_stream_playlist_tracks_retries_429_before_reading():
+    statuses = iter([429, 200])
+
+    def handler(request):
+        if next(statuses) == 429:
+            return httpx.Response(429, headers={"Retry-After": "0"})
+        return httpx.Response(200, json={"items": [{"track": None}]})
+
+    client = make_client(handler)
+
+    assert [i async for i in client.stream_playlist_tracks("p")] == [{"track": None}]
@@ -0,0 +1,71 @@
+"""MCP tool behaviour, exercised in-memory against a mocked Spotify API."""
+
+import asyncio
+
+import httpx
+from mcp.shared.memory import create_connected_server_and_client_session
+
+from spotify_mcp import server
+from spotify_mcp.client import SpotifyClient
+from spotify_mcp.context import SpotifyContext
+
+
+class FakeAuth:
+    async def get_auth_header(self) -> str:
+        return "Bearer test"
+
+
+def _track(n: int) -> dict:
+    return {
+        "name": f"Song {n}",
+        "uri": f"spotify:track:{n}",
+        "duration_ms": 185000,
+        "artists": [{"name": "Artist"}],
+        "album": {"name": "Album"},
+    }
+
+
+async def test_queue_add_many_queues_in_order_and_reports_failures(monkeypatch):
+    queued = []
+
+    async def handler(request):
+        path = request.url.path
+        if path == "/v1/search":
+            query = request.url.params["q"]
+            if query == "broken":
+                return httpx.Response(400, json={"error": {"message": "Bad query"}})
+            if query == "nothing":
+                return httpx.Response(200, json={"tracks": {"items": []}})
+            n = int(query)
+            # Earlier queries answer last, so search order != input order
+            await asyncio.sleep(0.05 * (3 - n))
+            return httpx.Response(200, json={"tracks": {"items": [_track(n)]}})
+        if path == "/v1/me/player/devices":
+            return httpx.Response(200, json={"devices": [{"id": "d1"}]})
+        if path == "/v1/me/player/queue":
+            queued.append(request.url.params["uri"])
+            return httpx.Response(204)
+        return httpx.Response(404)
+
+    http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    client = SpotifyClient(FakeAuth(), http, max_rate=1000)
+    monkeypatch.setattr(
+        server, "_spotify", SpotifyContext(http=http, auth=FakeAuth(), client=client)
+    )
+
+    async with create_connected_server_and_client_session(
+        server.mcp._mcp_server
+    ) as session:
+        result = await session.call_tool(
+            "spotify_queue_add_many",
+            {"queries": ["1", "broken", "2", "nothing", "3"]},
+        )
+
+    assert queued == ["spotify:track:1", "spotify:track:2", "spotify:track:3"]
+    assert result.content[0].text.splitlines() == [
+        '- Added: "Song 1" by Artist (Album) [3:05]',
+        "- 'broken': Spotify API error (400): Bad query",
+        '- Added: "Song 2" by Artist (Album) [3:05]',
+        "- No tracks found for 'nothing'.",
+        '- Added: "Song 3" by Artist (Album) [3:05]',
+    ]